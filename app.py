@@ -21,6 +21,7 @@ from utils.visualizer import (
     plot_company_distribution,
     plot_geographical_distribution,
     plot_location_type_distribution,
+    classify_locations,
     extract_region
 )
 from utils.predictor import (
@@ -45,6 +46,8 @@ from utils.job_comparator import (
 )
 from utils.skill_tracker import (
     extract_skills_from_jobs,
+    ensure_job_skills,
+    prepare_skills,
     plot_top_skills,
     skills_by_job_type,
     plot_skill_trends,
@@ -75,6 +78,7 @@ from utils.live_data import (
 )
 from utils.resume_analyzer import (
     extract_resume_skills,
+    build_skill_index,
     compare_resume_to_market,
     find_matching_job_types,
     plot_skill_gap_analysis,
@@ -384,9 +388,12 @@ else:
         fig4 = plot_company_distribution(display_data)
         st.plotly_chart(fig4, use_container_width=True)
         
+    # Classify the locations once for the geographical and location type tabs
+    classified_locations = classify_locations(display_data)
+    
     with tabs[4]:
         st.subheader("Geographical Distribution")
-        fig5 = plot_geographical_distribution(display_data)
+        fig5 = plot_geographical_distribution(display_data, classified_locations=classified_locations)
         st.plotly_chart(fig5, use_container_width=True)
         
         # Add help text explaining regions
@@ -407,7 +414,7 @@ else:
     
     with tabs[5]:
         st.subheader("Job Types by Work Arrangement")
-        fig6 = plot_location_type_distribution(display_data)
+        fig6 = plot_location_type_distribution(display_data, classified_locations=classified_locations)
         st.plotly_chart(fig6, use_container_width=True)
         
     with tabs[6]:
@@ -802,27 +809,31 @@ else:
             
             # Check if we have any skill data
             if 'skills' in skills_data.columns and not skills_data['skills'].apply(lambda x: len(x) if isinstance(x, list) else 0).sum() == 0:
+                # Extract, explode and count the skills once for all the
+                # skill plots
+                prepared_skills = prepare_skills(skills_data)
+                
                 # Top skills visualization
                 st.subheader("Top Skills in Demand")
                 
-                skill_count_fig = plot_top_skills(skills_data, n=15)
+                skill_count_fig = plot_top_skills(skills_data, n=15, prepared_skills=prepared_skills)
                 st.plotly_chart(skill_count_fig, use_container_width=True)
                 
                 # Skills by job type
                 st.subheader("Skills Required by Job Type")
-                skill_job_fig = skills_by_job_type(skills_data)
+                skill_job_fig = skills_by_job_type(skills_data, prepared_skills=prepared_skills)
                 st.plotly_chart(skill_job_fig, use_container_width=True)
                 
                 # Skill trends over time
                 if len(skills_data['month_year'].unique()) >= 2:
                     st.subheader("Skill Popularity Trends")
-                    skill_trend_fig = plot_skill_trends(skills_data)
+                    skill_trend_fig = plot_skill_trends(skills_data, prepared_skills=prepared_skills)
                     st.plotly_chart(skill_trend_fig, use_container_width=True)
                 
                 # Emerging skills 
                 if len(skills_data['month_year'].unique()) >= 2:
                     st.subheader("Emerging Skills")
-                    emerging_fig = plot_emerging_skills(skills_data)
+                    emerging_fig = plot_emerging_skills(skills_data, prepared_skills=prepared_skills)
                     st.plotly_chart(emerging_fig, use_container_width=True)
                     
                     st.info("Emerging skills are those showing the highest growth rates in recent job postings. "
@@ -1325,13 +1336,14 @@ else:
                         # Compare with market demand
                         st.write("### Market Demand Analysis")
                         
-                        # Process data for skill analysis if needed
-                        skill_data = display_data.copy()
-                        if 'skills' not in skill_data.columns:
-                            skill_data = extract_skills_from_jobs(skill_data)
+                        # Process data for skill analysis if needed, and explode
+                        # the job skills once for the market comparison and the
+                        # job type matching
+                        skill_data = ensure_job_skills(display_data)
+                        skill_index = build_skill_index(skill_data)
                         
                         # Compare resume to market demand
-                        market_analysis = compare_resume_to_market(resume_skills, skill_data)
+                        market_analysis = compare_resume_to_market(resume_skills, skill_data, skill_index=skill_index)
                         
                         # Show match percentage
                         st.metric(
@@ -1356,7 +1368,7 @@ else:
                                     st.write(f"→ {skill}")
                         
                         # Find matching job types
-                        matching_jobs = find_matching_job_types(resume_skills, skill_data)
+                        matching_jobs = find_matching_job_types(resume_skills, skill_data, skill_index=skill_index)
                         
                         if not matching_jobs.empty:
                             st.write("### Best Matching Job Types for Your Skills")
@@ -1367,7 +1379,11 @@ else:
                             
                             # Skill improvement recommendations
                             recommendations = generate_skill_improvement_recommendations(
-                                {'resume_skills': resume_skills, 'job_type_matches': matching_jobs},
+                                {
+                                    'resume_skills': resume_skills,
+                                    'missing_key_skills': market_analysis['missing_key_skills'],
+                                    'job_type_matches': matching_jobs
+                                },
                                 skill_data
                             )
                             
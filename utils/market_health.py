@@ -3,7 +3,195 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from scipy.stats import zscore
+
+# Polars is optional: when it is installed (along with pyarrow, which it needs to
+# convert string columns from pandas) the monthly aggregation runs on its
+# multi-threaded engine, otherwise the pandas implementation is used
+try:
+    import polars as pl
+    import pyarrow
+except ImportError:
+    pl = None
+
+# Default factor weights for the composite health index
+DEFAULT_HEALTH_WEIGHTS = {
+    'job_count': 0.4,        # Total number of job postings
+    'company_diversity': 0.2, # Number of unique companies posting jobs
+    'job_type_diversity': 0.2, # Diversity of job types
+    'location_diversity': 0.1, # Diversity of locations
+    'remote_ratio': 0.1       # Proportion of remote job opportunities
+}
+
+# Health index cut-offs and the market sentiment for each band between them
+_SENTIMENT_CUTS = np.array([30, 45, 55, 70])
+_SENTIMENT = ['Very Weak', 'Weak', 'Stable', 'Strong', 'Very Strong']
+_SENTIMENT_COLOR = ['red', 'orange', 'blue', 'green', 'darkgreen']
+_SENTIMENT_DESCRIPTION = [
+    "The job market is experiencing significant challenges with few opportunities.",
+    "The job market is showing signs of weakness with limited opportunities.",
+    "The job market is stable with steady demand for workers.",
+    "The job market is healthy with good opportunities available.",
+    "The job market is booming with abundant opportunities."
+]
+
+def _sentiment_band(index_value):
+    """
+    Find the sentiment band for a health index value.
+    
+    Args:
+        index_value: Health index value on the 0-100 scale
+        
+    Returns:
+        Position of the band in the _SENTIMENT lookup tables
+    """
+    # A value equal to a cut-off belongs to the band above it
+    return int(np.searchsorted(_SENTIMENT_CUTS, index_value, side='right'))
+
+def _health_kernel(values, weight_vector, groups=None):
+    """
+    Normalize a (months x factors) matrix and combine it into the health index.
+    
+    Factors become clamped z-scores when there are at least 3 months of data
+    and are min-max scaled to [-1, 1] otherwise; normalization, clamping and
+    the weighted sum all run as whole-matrix numpy operations. When groups is
+    given, the statistics are computed separately within each group.
+    
+    Args:
+        values: 2-D array of monthly factor values, one column per factor
+        weight_vector: 1-D array of factor weights, in column order
+        groups: Optional array with a group label for each row
+        
+    Returns:
+        Tuple of (normalized factor matrix, health index array)
+    """
+    if groups is None:
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        min_val = np.nanmin(values, axis=0)
+        max_val = np.nanmax(values, axis=0)
+        month_counts = len(values)
+    else:
+        grouped = pd.DataFrame(values).groupby(groups, sort=False, observed=True)
+        mean = grouped.transform('mean').to_numpy()
+        std = grouped.transform('std', ddof=0).to_numpy()
+        min_val = grouped.transform('min').to_numpy()
+        max_val = grouped.transform('max').to_numpy()
+        month_counts = grouped.transform('size').to_numpy().reshape(-1, 1)
+    
+    # Factors that never change carry no signal and normalize to 0
+    z_norm = np.clip((values - mean) / np.where(std > 0, std, 1), -3, 3)
+    
+    # With limited data, use basic min-max scaling
+    value_range = max_val - min_val
+    scaled = (values - min_val) / np.where(value_range > 0, value_range, 1) * 2 - 1
+    range_norm = np.where(value_range > 0, scaled, 0)
+    
+    norm = np.where(month_counts >= 3, z_norm, range_norm)
+    
+    return norm, norm @ weight_vector
+
+def _rolling_mean(values, window):
+    """
+    Calculate a trailing moving average over a 1-D array.
+    
+    Uses a running sum so every window is computed in a single O(N) pass.
+    The first window - 1 entries are NaN, matching pandas' rolling().mean().
+    
+    Args:
+        values: 1-D array of values to smooth
+        window: Number of values to include in each average
+        
+    Returns:
+        NumPy array of moving averages
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    
+    if 0 < window <= len(values):
+        running_sum = np.cumsum(np.insert(values, 0, 0.0))
+        result[window - 1:] = (running_sum[window:] - running_sum[:-window]) / window
+    
+    return result
+
+def _aggregate_monthly_factors(health_df, by=None):
+    """
+    Aggregate the health index factors for each month in a single groupby.
+    
+    The remote flag is computed once per distinct location with a
+    case-insensitive substring scan, looked up through the categorical codes
+    and summed per group, rather than lowercasing and scanning the
+    locations of every month separately.
+    
+    Args:
+        health_df: DataFrame containing job posting data
+        by: Optional extra column to group by before month (e.g. 'region')
+        
+    Returns:
+        DataFrame with one row per (by, month_year) group and factor columns
+    """
+    keys = ['month_year'] if by is None else [by, 'month_year']
+    
+    if pl is not None:
+        return _aggregate_monthly_factors_polars(health_df, keys)
+    
+    # Categorical columns make nunique work on integer codes, and the remote
+    # check only has to scan each distinct location once
+    health_df = health_df.astype({column: 'category' for column in ('company', 'job_type', 'location')})
+    location = health_df['location'].cat
+    remote_mask = location.categories.str.contains('remote', case=False, regex=False)
+    is_remote = np.append(remote_mask, False)[location.codes]
+    
+    # Skip the groupby's own key sort and empty categories; only the small
+    # aggregated frame is sorted afterwards
+    stats = health_df.assign(_remote=is_remote).groupby(keys, sort=False, observed=True).agg(
+        job_count=('location', 'size'),
+        company_diversity=('company', 'nunique'),
+        job_type_diversity=('job_type', 'nunique'),
+        location_diversity=('location', 'nunique'),
+        remote_count=('_remote', 'sum')
+    ).reset_index().sort_values(keys, ignore_index=True)
+    
+    # Calculate remote ratio
+    stats['remote_ratio'] = stats.pop('remote_count') / stats['job_count']
+    
+    return stats
+
+def _aggregate_monthly_factors_polars(health_df, keys):
+    """
+    Polars implementation of _aggregate_monthly_factors.
+    
+    Only the grouping and factor columns are handed to Polars; the small
+    aggregated frame is converted back to pandas for the plotting code.
+    
+    Args:
+        health_df: DataFrame containing job posting data
+        keys: Columns to group by, ending with 'month_year'
+        
+    Returns:
+        DataFrame with one row per group and factor columns
+    """
+    columns = list(dict.fromkeys(keys + ['company', 'job_type', 'location']))
+    
+    stats = (
+        pl.from_pandas(health_df[columns])
+        .with_columns(pl.col('location').str.contains('(?i)remote').fill_null(False).alias('_remote'))
+        .group_by(keys)
+        .agg(
+            pl.len().alias('job_count'),
+            pl.col('company').drop_nulls().n_unique().alias('company_diversity'),
+            pl.col('job_type').drop_nulls().n_unique().alias('job_type_diversity'),
+            pl.col('location').drop_nulls().n_unique().alias('location_diversity'),
+            pl.col('_remote').sum().alias('remote_count')
+        )
+        .with_columns(pl.exclude(keys).cast(pl.Int64))
+        .sort(keys)
+        .to_pandas()
+    )
+    
+    # Calculate remote ratio
+    stats['remote_ratio'] = stats.pop('remote_count') / stats['job_count']
+    
+    return stats
 
 def calculate_job_market_health_index(df, window=3, weights=None):
     """
@@ -17,96 +205,50 @@ def calculate_job_market_health_index(df, window=3, weights=None):
     Returns:
         DataFrame with index values by month
     """
-    # Create a copy to avoid modifying the original
-    health_df = df.copy()
-    
-    # Convert date to datetime if it's not already
-    if not pd.api.types.is_datetime64_any_dtype(health_df['date']):
-        health_df['date'] = pd.to_datetime(health_df['date'])
-    
-    # Sort by date
-    health_df = health_df.sort_values('date')
+    # Only the columns needed for the monthly factors; nothing is modified in
+    # place, so the input doesn't need to be copied
+    health_df = df[['month_year', 'company', 'job_type', 'location']]
     
     # Default weights if none provided
     if weights is None:
-        weights = {
-            'job_count': 0.4,        # Total number of job postings
-            'company_diversity': 0.2, # Number of unique companies posting jobs
-            'job_type_diversity': 0.2, # Diversity of job types
-            'location_diversity': 0.1, # Diversity of locations
-            'remote_ratio': 0.1       # Proportion of remote job opportunities
-        }
-    
-    # Group by month_year to get monthly statistics
-    monthly_stats = []
-    
-    for month, month_df in health_df.groupby('month_year'):
-        # Calculate factors
-        job_count = len(month_df)
-        company_diversity = len(month_df['company'].unique())
-        job_type_diversity = len(month_df['job_type'].unique())
-        location_diversity = len(month_df['location'].unique())
-        
-        # Calculate remote ratio
-        remote_count = month_df['location'].str.lower().str.contains('remote').sum()
-        remote_ratio = remote_count / job_count if job_count > 0 else 0
-        
-        # Store statistics
-        monthly_stats.append({
-            'month_year': month,
-            'date': pd.to_datetime(month),
-            'job_count': job_count,
-            'company_diversity': company_diversity,
-            'job_type_diversity': job_type_diversity,
-            'location_diversity': location_diversity,
-            'remote_ratio': remote_ratio
-        })
-    
-    # Convert to DataFrame
-    monthly_stats_df = pd.DataFrame(monthly_stats)
+        weights = DEFAULT_HEALTH_WEIGHTS
+    
+    # Group by month_year to get monthly statistics; the aggregates don't depend
+    # on row order and the monthly dates come from month_year, so the postings
+    # are neither re-parsed nor sorted by date
+    monthly_stats_df = _aggregate_monthly_factors(health_df)
+    monthly_stats_df.insert(1, 'date', pd.to_datetime(monthly_stats_df['month_year']))
     
     # If no data, return empty DataFrame
     if len(monthly_stats_df) == 0:
         return pd.DataFrame()
     
-    # Sort by date
-    monthly_stats_df = monthly_stats_df.sort_values('date')
-    
-    # Normalize each factor (convert to z-scores, but clamp outliers)
-    for factor in weights.keys():
-        if factor in monthly_stats_df.columns:
-            # Only normalize if we have enough data points
-            if len(monthly_stats_df) >= 3:
-                monthly_stats_df[f'{factor}_norm'] = zscore(monthly_stats_df[factor], nan_policy='omit')
-                # Clamp extreme values
-                monthly_stats_df[f'{factor}_norm'] = monthly_stats_df[f'{factor}_norm'].clip(-3, 3)
-            else:
-                # With limited data, use basic min-max scaling
-                min_val = monthly_stats_df[factor].min()
-                max_val = monthly_stats_df[factor].max()
-                if max_val > min_val:
-                    monthly_stats_df[f'{factor}_norm'] = (monthly_stats_df[factor] - min_val) / (max_val - min_val) * 2 - 1
-                else:
-                    monthly_stats_df[f'{factor}_norm'] = 0
-    
-    # Calculate weighted index
-    monthly_stats_df['health_index'] = 0
-    for factor, weight in weights.items():
-        if f'{factor}_norm' in monthly_stats_df.columns:
-            monthly_stats_df['health_index'] += monthly_stats_df[f'{factor}_norm'] * weight
+    # Sort by date (the aggregated frame is normally already in month order)
+    if not monthly_stats_df['date'].is_monotonic_increasing:
+        monthly_stats_df = monthly_stats_df.sort_values('date')
+    
+    # Normalize each factor (convert to z-scores, but clamp outliers) and
+    # combine them into the weighted index
+    factors = [factor for factor in weights.keys() if factor in monthly_stats_df.columns]
+    values = monthly_stats_df[factors].to_numpy(dtype=np.float64)
+    weight_vector = np.array([weights[factor] for factor in factors], dtype=np.float64)
+    norm, health_index = _health_kernel(values, weight_vector)
+    
+    norm_df = pd.DataFrame(norm, columns=[f'{factor}_norm' for factor in factors], index=monthly_stats_df.index)
+    monthly_stats_df = pd.concat([monthly_stats_df, norm_df], axis=1)
+    monthly_stats_df['health_index'] = health_index
     
     # Convert to 0-100 scale for easier interpretation
-    min_index = monthly_stats_df['health_index'].min()
-    max_index = monthly_stats_df['health_index'].max()
-    if max_index > min_index:
-        monthly_stats_df['health_index_scaled'] = ((monthly_stats_df['health_index'] - min_index) / 
-                                                  (max_index - min_index) * 100)
+    min_index = health_index.min()
+    index_range = np.ptp(health_index)
+    if index_range > 0:
+        monthly_stats_df['health_index_scaled'] = (health_index - min_index) / index_range * 100
     else:
         monthly_stats_df['health_index_scaled'] = 50  # Default to middle value
     
     # Apply moving average to smooth the index
     if len(monthly_stats_df) >= window:
-        monthly_stats_df['health_index_ma'] = monthly_stats_df['health_index_scaled'].rolling(window=window).mean()
+        monthly_stats_df['health_index_ma'] = _rolling_mean(monthly_stats_df['health_index_scaled'].to_numpy(), window)
     else:
         monthly_stats_df['health_index_ma'] = monthly_stats_df['health_index_scaled']
     
@@ -179,21 +321,9 @@ def plot_job_market_health_index(df, window=3):
     latest_change = health_df['mom_change'].iloc[-1]
     
     # Determine market sentiment
-    if latest_index >= 70:
-        sentiment = "Very Strong"
-        color = "darkgreen"
-    elif latest_index >= 55:
-        sentiment = "Strong"
-        color = "green"
-    elif latest_index >= 45:
-        sentiment = "Stable"
-        color = "blue"
-    elif latest_index >= 30:
-        sentiment = "Weak"
-        color = "orange"
-    else:
-        sentiment = "Very Weak"
-        color = "red"
+    band = _sentiment_band(latest_index)
+    sentiment = _SENTIMENT[band]
+    color = _SENTIMENT_COLOR[band]
     
     # Add annotation for the latest value
     fig.add_annotation(
@@ -214,7 +344,8 @@ def plot_job_market_health_index(df, window=3):
         yaxis_title="Health Index (0-100)",
         legend_title="Index Type",
         yaxis=dict(range=[0, 100]),
-        height=500
+        height=500,
+        uirevision='constant'
     )
     
     return fig
@@ -241,30 +372,14 @@ def get_market_health_insights(df, window=3):
     latest = health_df.iloc[-1]
     
     # Determine market sentiment
-    if latest['health_index_ma'] >= 70:
-        sentiment = "Very Strong"
-        color = "darkgreen"
-        description = "The job market is booming with abundant opportunities."
-    elif latest['health_index_ma'] >= 55:
-        sentiment = "Strong"
-        color = "green"
-        description = "The job market is healthy with good opportunities available."
-    elif latest['health_index_ma'] >= 45:
-        sentiment = "Stable"
-        color = "blue"
-        description = "The job market is stable with steady demand for workers."
-    elif latest['health_index_ma'] >= 30:
-        sentiment = "Weak"
-        color = "orange"
-        description = "The job market is showing signs of weakness with limited opportunities."
-    else:
-        sentiment = "Very Weak"
-        color = "red"
-        description = "The job market is experiencing significant challenges with few opportunities."
+    band = _sentiment_band(latest['health_index_ma'])
+    sentiment = _SENTIMENT[band]
+    color = _SENTIMENT_COLOR[band]
+    description = _SENTIMENT_DESCRIPTION[band]
     
     # Determine trend
     if len(health_df) >= 3:
-        trend_values = health_df['health_index_ma'].iloc[-3:].values
+        trend_values = health_df['health_index_ma'].to_numpy()[-3:]
         if trend_values[2] > trend_values[0]:
             trend = "Improving"
             trend_icon = "↗"
@@ -382,7 +497,8 @@ def plot_market_health_components(df):
                 range=[0, 100]
             )
         ),
-        showlegend=True
+        showlegend=True,
+        uirevision='constant'
     )
     
     return fig
@@ -391,6 +507,10 @@ def calculate_regional_health_indices(df):
     """
     Calculate job market health indices for different regions.
     
+    All regions are aggregated in a single (region, month) groupby and
+    normalized with grouped transforms, rather than running the full
+    health index pipeline once per region.
+    
     Args:
         df: DataFrame containing job posting data
         
@@ -400,33 +520,48 @@ def calculate_regional_health_indices(df):
     # Get region for each job
     from utils.visualizer import extract_region
     
-    # Create a copy with region information
-    regional_df = df.copy()
-    regional_df['region'] = regional_df['location'].apply(extract_region)
+    if df.empty:
+        return pd.DataFrame()
     
-    # Calculate health index for each region
-    region_indices = []
+    # Resolve each distinct location once and map the result back to every row
+    unique_locations = df['location'].unique()
+    region_map = dict(zip(unique_locations, map(extract_region, unique_locations)))
     
-    for region, region_df in regional_df.groupby('region'):
-        # Calculate health index for this region
-        region_health = calculate_job_market_health_index(region_df)
-        
-        # If enough data, get the latest index
-        if len(region_health) > 0:
-            latest = region_health.iloc[-1]
-            
-            region_indices.append({
-                'region': region,
-                'health_index': latest['health_index_scaled'],
-                'job_count': latest['job_count'],
-                'company_diversity': latest['company_diversity'],
-                'job_type_diversity': latest['job_type_diversity'],
-                'location_diversity': latest['location_diversity'],
-                'remote_ratio': latest['remote_ratio']
-            })
-    
-    # Convert to DataFrame
-    region_indices_df = pd.DataFrame(region_indices)
+    # Only the columns needed for the monthly factors, plus region
+    regional_df = df[['month_year', 'company', 'job_type', 'location']].assign(
+        region=df['location'].map(region_map)
+    )
+    
+    # Monthly statistics for every region in one pass
+    stats = _aggregate_monthly_factors(regional_df, by='region')
+    
+    # Normalize each factor within its region and combine into the weighted index
+    factors = list(DEFAULT_HEALTH_WEIGHTS.keys())
+    weight_vector = np.array(list(DEFAULT_HEALTH_WEIGHTS.values()), dtype=np.float64)
+    _, stats['health_index'] = _health_kernel(
+        stats[factors].to_numpy(dtype=np.float64),
+        weight_vector,
+        groups=stats['region'].to_numpy()
+    )
+    
+    by_region = stats.groupby('region', sort=False, observed=True)
+    
+    # Convert to 0-100 scale within each region
+    min_index = by_region['health_index'].transform('min')
+    max_index = by_region['health_index'].transform('max')
+    stats['health_index'] = ((stats['health_index'] - min_index) /
+                             (max_index - min_index) * 100).where(max_index > min_index, 50)
+    
+    # Keep the latest month for each region
+    region_indices_df = stats.groupby('region', sort=False, observed=True).tail(1)[[
+        'region',
+        'health_index',
+        'job_count',
+        'company_diversity',
+        'job_type_diversity',
+        'location_diversity',
+        'remote_ratio'
+    ]].reset_index(drop=True)
     
     # Sort by health index
     if not region_indices_df.empty:
@@ -2,10 +2,14 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
-from sklearn.linear_model import LinearRegression
 import plotly.express as px
 import plotly.graph_objects as go
 
+# Fitted Holt-Winters models keyed by job type and the exact monthly series,
+# so re-rendering the same forecast doesn't refit the model
+_FITTED_MODEL_CACHE = {}
+_FITTED_MODEL_CACHE_SIZE = 64
+
 def prepare_time_series_data(df, time_column='month_year', value_column='count', freq='MS'):
     """
     Prepare time series data for predictive modeling.
@@ -71,17 +75,27 @@ def forecast_job_trends(df, periods=6, job_type=None):
     # Sort by date
     ts_data = ts_data.sort_index()
     
-    # Apply Holt-Winters Exponential Smoothing
-    # Use additive for stable trends, multiplicative for exponential growth
-    model = ExponentialSmoothing(
-        ts_data,
-        trend='add',  # 'add' for additive, 'mul' for multiplicative
-        seasonal='add',  # 'add' for additive, 'mul' for multiplicative
-        seasonal_periods=3  # Adjust based on data seasonality
-    )
-    
-    # Fit the model
-    fitted_model = model.fit(optimized=True, use_brute=True)
+    # Reuse the fitted model if this exact series has been fitted before
+    cache_key = (job_type, tuple(ts_data.index.asi8), tuple(ts_data.to_numpy()))
+    fitted_model = _FITTED_MODEL_CACHE.get(cache_key)
+    
+    if fitted_model is None:
+        # Apply Holt-Winters Exponential Smoothing
+        # Use additive for stable trends, multiplicative for exponential growth
+        model = ExponentialSmoothing(
+            ts_data,
+            trend='add',  # 'add' for additive, 'mul' for multiplicative
+            seasonal='add',  # 'add' for additive, 'mul' for multiplicative
+            seasonal_periods=3  # Adjust based on data seasonality
+        )
+        
+        # Fit the model with a local optimizer from the default starting
+        # values instead of a brute-force grid search
+        fitted_model = model.fit(optimized=True, use_brute=False, method='L-BFGS-B')
+        
+        if len(_FITTED_MODEL_CACHE) >= _FITTED_MODEL_CACHE_SIZE:
+            _FITTED_MODEL_CACHE.pop(next(iter(_FITTED_MODEL_CACHE)))
+        _FITTED_MODEL_CACHE[cache_key] = fitted_model
     
     # Generate forecast
     forecast = fitted_model.forecast(periods)
@@ -114,54 +128,43 @@ def predict_job_type_growth(df, periods=6):
     # Get all unique job types
     job_types = df['job_type'].unique()
     
-    # Create empty dataframe for results
-    growth_rates = pd.DataFrame(index=job_types, columns=['Current', 'Predicted', 'Growth %'])
+    # Monthly posting counts for every job type, in chronological order
+    monthly_counts = df.groupby(['job_type', 'month_year']).size().reset_index(name='count')
+    monthly_counts['date'] = pd.to_datetime(monthly_counts['month_year'])
+    monthly_counts = monthly_counts.sort_values(['job_type', 'date'], kind='stable')
     
-    # Calculate growth rate for each job type
-    for job_type in job_types:
-        # Filter data for current job type
-        job_data = df[df['job_type'] == job_type].copy()
-        
-        # Group by month_year and count
-        monthly_counts = job_data.groupby('month_year').size()
-        monthly_counts.index = pd.to_datetime(monthly_counts.index)
-        monthly_counts = monthly_counts.sort_index()
-        
-        # Need at least 2 data points for prediction
-        if len(monthly_counts) >= 2:
-            # Get current count (average of last 3 months or all if less than 3)
-            current_count = monthly_counts.iloc[-min(3, len(monthly_counts)):].mean()
-            
-            # Convert dates to numeric values for linear regression
-            X = np.array(range(len(monthly_counts))).reshape(-1, 1)
-            y = monthly_counts.values
-            
-            # Fit linear regression model
-            model = LinearRegression()
-            model.fit(X, y)
-            
-            # Predict future values
-            future_X = np.array(range(len(monthly_counts), len(monthly_counts) + periods)).reshape(-1, 1)
-            future_y = model.predict(future_X)
-            
-            # Calculate predicted count (average of predicted months)
-            predicted_count = np.mean(future_y)
-            
-            # Calculate growth percentage
-            if current_count > 0:
-                growth_percent = ((predicted_count - current_count) / current_count) * 100
-            else:
-                growth_percent = 0
-            
-            # Store results
-            growth_rates.loc[job_type] = [
-                round(current_count, 1),
-                round(predicted_count, 1),
-                round(growth_percent, 1)
-            ]
-        else:
-            # Not enough data for prediction
-            growth_rates.loc[job_type] = [0, 0, 0]
+    by_type = monthly_counts.groupby('job_type')
+    
+    # Months are numbered 0..n-1 within each job type, as in a per-type fit
+    x = by_type.cumcount().astype(np.float64)
+    y = monthly_counts['count'].astype(np.float64)
+    
+    # Closed-form least squares for all job types at once from grouped sums
+    sums = pd.DataFrame({'x': x, 'y': y, 'xy': x * y, 'xx': x * x}).groupby(monthly_counts['job_type']).sum()
+    n = by_type.size()
+    denominator = n * sums['xx'] - sums['x'] ** 2
+    slope = (n * sums['xy'] - sums['x'] * sums['y']) / denominator.where(denominator != 0)
+    
+    # Predicted count is the average of the fitted line over the next periods
+    # months; the line passes through the mean of y at x = (n - 1) / 2
+    predicted_count = sums['y'] / n + slope * (n + periods) / 2
+    
+    # Current count is the average of the last 3 months (or all if less than 3)
+    current_count = by_type.tail(3).groupby('job_type')['count'].mean()
+    
+    # Calculate growth percentage
+    growth_percent = ((predicted_count - current_count) / current_count * 100).where(current_count > 0, 0)
+    
+    growth_rates = pd.DataFrame({
+        'Current': current_count,
+        'Predicted': predicted_count,
+        'Growth %': growth_percent
+    }).round(1)
+    
+    # Need at least 2 data points for prediction; job types without any
+    # monthly counts (missing job type or months) get no growth either
+    growth_rates[n < 2] = 0
+    growth_rates = growth_rates.reindex(job_types).fillna(0).rename_axis(None)
     
     # Sort by growth percentage in descending order
     growth_rates = growth_rates.sort_values('Growth %', ascending=False)
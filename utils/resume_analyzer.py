@@ -3,7 +3,117 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import re
-from utils.skill_tracker import COMMON_SKILLS, extract_skills_from_text
+from collections import Counter
+from itertools import chain
+from utils.skill_tracker import COMMON_SKILLS, extract_skills_from_text, ensure_job_skills
+
+# Title keywords that don't fit each experience level and the factor applied
+# to the match score of job titles containing them
+_TITLE_PENALTIES = {
+    'entry': ('senior|lead', 0.5),
+    'mid': ('senior', 0.8),
+    'senior': ('junior', 0.5)
+}
+
+# Common patterns for years of experience, in order of preference
+_EXPERIENCE_YEARS_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience'),
+    re.compile(r'experience\s*(?:of\s*)?(\d+)\+?\s*years?'),
+    re.compile(r'(?:work|professional)\s+experience\s*(?:of\s*)?(\d+)\+?\s*years?'),
+    re.compile(r'(?:worked|been working)\s+for\s+(\d+)\+?\s*years?')
+]
+
+# Work history date ranges such as "Jan 2020 - Present"
+_WORK_HISTORY_PATTERN = re.compile(
+    r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})\s*(?:-|–|to)\s*'
+    r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present|Current|Now)'
+)
+
+def _skill_bit_matrix(skill_lists, skill_names=None):
+    """
+    Encode skill lists as bit sets, one bit per distinct skill.
+    
+    Args:
+        skill_lists: Iterable of skill lists, one per job
+        skill_names: Optional Index giving the bit position of each skill;
+            built from the skills in skill_lists if not given
+        
+    Returns:
+        Tuple of (uint64 array with one row of 64-bit words per list, Index of
+        skill names in bit order)
+    """
+    skill_counts = np.fromiter(map(len, skill_lists), dtype=np.int64, count=len(skill_lists))
+    flat_skills = np.fromiter(chain.from_iterable(skill_lists), dtype=object, count=skill_counts.sum())
+    
+    # Number the skills by bit position
+    if skill_names is None:
+        skill_ids, skill_names = pd.factorize(flat_skills)
+        skill_names = pd.Index(skill_names)
+    else:
+        skill_ids = skill_names.get_indexer(flat_skills)
+    
+    # Set the bit of every skill in its list's row
+    bits = np.zeros((len(skill_counts), len(skill_names) // 64 + 1), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(skill_counts)), skill_counts)
+    np.bitwise_or.at(bits, (rows, skill_ids // 64), np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64)))
+    
+    return bits, skill_names
+
+def _popcount(bits):
+    """
+    Count the set bits in each row of a uint64 bit matrix.
+    
+    Args:
+        bits: 2-D uint64 array
+        
+    Returns:
+        NumPy array with the number of set bits per row
+    """
+    # np.bitwise_count (NumPy 2.0+) maps to the CPU's popcount instruction
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    
+    return np.unpackbits(bits.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+def build_skill_index(df):
+    """
+    Explode the job posting skills once for reuse by the analysis functions.
+    
+    Args:
+        df: DataFrame containing job posting data
+        
+    Returns:
+        Dictionary with the number of job postings and their index, the
+        market demand (job count per skill, most demanded first) and the
+        distinct (job_type, skill) pairs
+    """
+    # Ensure skills are extracted from job postings
+    job_df = ensure_job_skills(df)
+    
+    # Explode only the columns the analysis needs, with the job types as a
+    # categorical so they are grouped by integer code
+    skills_exploded = job_df[['job_type', 'skills']].astype({'job_type': 'category'}).explode('skills')
+    
+    return {
+        'job_count': len(job_df),
+        'job_index': job_df.index,
+        'market_demand': skills_exploded['skills'].value_counts(),
+        'job_type_skills': skills_exploded.dropna().drop_duplicates()
+    }
+
+def _check_skill_index(skill_index, df):
+    """
+    Make sure a prebuilt skill index was built from the given job postings.
+    
+    Args:
+        skill_index: Result of build_skill_index
+        df: DataFrame containing job posting data
+    """
+    if skill_index['job_count'] != len(df) or not skill_index['job_index'].equals(df.index):
+        raise ValueError(
+            f"skill_index was not built from these job postings "
+            f"({skill_index['job_count']} in the index, {len(df)} in df)"
+        )
 
 def extract_resume_skills(resume_text):
     """
@@ -17,41 +127,44 @@ def extract_resume_skills(resume_text):
     """
     return extract_skills_from_text(resume_text, COMMON_SKILLS)
 
-def compare_resume_to_market(resume_skills, df):
+def compare_resume_to_market(resume_skills, df, skill_index=None):
     """
     Compare resume skills to job market demand.
     
     Args:
         resume_skills: List of skills extracted from resume
         df: DataFrame containing job posting data
+        skill_index: Optional result of build_skill_index(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         Dictionary with comparison results
     """
-    # Ensure skills are extracted from job postings
-    if 'skills' not in df.columns:
-        from utils.skill_tracker import extract_skills_from_jobs
-        job_df = extract_skills_from_jobs(df)
+    # Explode the job posting skills unless already done for these postings
+    if skill_index is None:
+        skill_index = build_skill_index(df)
     else:
-        job_df = df
+        _check_skill_index(skill_index, df)
     
-    # Explode the skills lists into separate rows
-    skills_exploded = job_df.explode('skills')
+    # Set of resume skills for constant-time membership checks
+    resume_set = frozenset(resume_skills)
     
     # Get market demand for each skill
-    market_demand = skills_exploded['skills'].value_counts().reset_index()
+    market_demand = skill_index['market_demand'].reset_index()
     market_demand.columns = ['skill', 'job_count']
     
     # Calculate percentage of jobs requiring each skill
-    total_jobs = len(job_df)
+    total_jobs = skill_index['job_count']
     market_demand['demand_pct'] = (market_demand['job_count'] / total_jobs) * 100
     
     # Filter to only include skills in our resume
-    resume_skill_demand = market_demand[market_demand['skill'].isin(resume_skills)]
+    resume_skill_demand = market_demand[market_demand['skill'].isin(resume_set)]
     
-    # Find missing in-demand skills (top 20 that aren't in the resume)
-    top_skills = market_demand.head(20)['skill'].tolist()
-    missing_skills = [skill for skill in top_skills if skill not in resume_skills]
+    # Find missing in-demand skills (top 20 that aren't in the resume),
+    # keeping them in order of demand
+    top_skills = skill_index['market_demand'].index[:20]
+    top_skills_in_resume = top_skills.intersection(resume_set)
+    missing_skills = top_skills.difference(resume_set, sort=False).tolist()
     
     # Get skills that are on the resume but not in high demand
     low_demand_skills = resume_skill_demand[resume_skill_demand['demand_pct'] < 1]['skill'].tolist()
@@ -65,8 +178,7 @@ def compare_resume_to_market(resume_skills, df):
         match_percentage = 0
     
     # Calculate market coverage
-    if top_skills:
-        top_skills_in_resume = [skill for skill in top_skills if skill in resume_skills]
+    if len(top_skills) > 0:
         market_coverage = (len(top_skills_in_resume) / len(top_skills)) * 100
     else:
         market_coverage = 0
@@ -76,7 +188,7 @@ def compare_resume_to_market(resume_skills, df):
     
     return {
         'resume_skills': resume_skills,
-        'skills_in_demand': resume_skill_demand.to_dict('records'),
+        'skills_in_demand': resume_skill_demand.reset_index(drop=True),
         'missing_key_skills': missing_skills,
         'low_demand_skills': low_demand_skills,
         'match_percentage': match_percentage,
@@ -84,7 +196,7 @@ def compare_resume_to_market(resume_skills, df):
         'gap_score': gap_score
     }
 
-def find_matching_job_types(resume_skills, df, threshold=0.3):
+def find_matching_job_types(resume_skills, df, threshold=0.3, skill_index=None):
     """
     Find job types that match the resume skills.
     
@@ -92,52 +204,37 @@ def find_matching_job_types(resume_skills, df, threshold=0.3):
         resume_skills: List of skills extracted from resume
         df: DataFrame containing job posting data
         threshold: Minimum skill match threshold
+        skill_index: Optional result of build_skill_index(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         DataFrame with matching job types and scores
     """
-    # Ensure skills are extracted from job postings
-    if 'skills' not in df.columns:
-        from utils.skill_tracker import extract_skills_from_jobs
-        job_df = extract_skills_from_jobs(df)
+    # Explode the job posting skills unless already done for these postings
+    if skill_index is None:
+        skill_index = build_skill_index(df)
     else:
-        job_df = df
+        _check_skill_index(skill_index, df)
+    
+    # Get the distinct required skills of each job type in one long frame
+    job_type_skills = skill_index['job_type_skills']
     
-    # Get job types with their required skills
-    job_type_skills = {}
-    for job_type, jobs in job_df.groupby('job_type'):
-        # Combine all skills for this job type
-        all_skills = set()
-        for skills_list in jobs['skills']:
-            all_skills.update(skills_list)
-        job_type_skills[job_type] = list(all_skills)
+    # Count the required skills and the ones on the resume per job type;
+    # job types without skills don't appear at all
+    resume_set = frozenset(resume_skills)
+    skill_counts = job_type_skills['skills'].isin(resume_set).groupby(job_type_skills['job_type'], observed=True).agg(['size', 'sum'])
     
     # Calculate match score for each job type
-    job_type_matches = []
+    matches_df = pd.DataFrame({
+        'job_type': skill_counts.index.to_numpy(),
+        'required_skills': skill_counts['size'].to_numpy(),
+        'matching_skills': skill_counts['sum'].to_numpy(),
+        'match_score': (skill_counts['sum'] / skill_counts['size']).to_numpy()
+    })
+    matches_df['match_percentage'] = matches_df['match_score'] * 100
     
-    for job_type, skills in job_type_skills.items():
-        # Skip if no skills for this job type
-        if not skills:
-            continue
-        
-        # Calculate overlap
-        matching_skills = [skill for skill in resume_skills if skill in skills]
-        
-        # Calculate match score
-        match_score = len(matching_skills) / len(skills) if skills else 0
-        
-        # Only include if match score meets threshold
-        if match_score >= threshold:
-            job_type_matches.append({
-                'job_type': job_type,
-                'required_skills': len(skills),
-                'matching_skills': len(matching_skills),
-                'match_score': match_score,
-                'match_percentage': match_score * 100
-            })
-    
-    # Convert to DataFrame
-    matches_df = pd.DataFrame(job_type_matches)
+    # Only include job types whose match score meets the threshold
+    matches_df = matches_df[matches_df['match_score'] >= threshold].reset_index(drop=True)
     
     # Sort by match score
     if not matches_df.empty:
@@ -155,11 +252,12 @@ def plot_skill_gap_analysis(resume_analysis):
     Returns:
         Plotly figure object
     """
-    # Extract data from analysis
-    skills_in_demand = resume_analysis['skills_in_demand']
+    # Extract data from analysis; it is already sorted by demand, most
+    # demanded first (a list of records is also accepted)
+    skills_df = pd.DataFrame(resume_analysis['skills_in_demand'])
     
     # If no skills in demand, return empty figure with message
-    if not skills_in_demand:
+    if skills_df.empty:
         fig = go.Figure()
         fig.add_annotation(
             text="No skills from your resume match current market demand",
@@ -169,12 +267,6 @@ def plot_skill_gap_analysis(resume_analysis):
         )
         return fig
     
-    # Create DataFrame for visualization
-    skills_df = pd.DataFrame(skills_in_demand)
-    
-    # Sort by demand percentage
-    skills_df = skills_df.sort_values('demand_pct', ascending=False)
-    
     # Create bar chart
     fig = px.bar(
         skills_df,
@@ -341,18 +433,14 @@ def generate_skill_improvement_recommendations(resume_analysis, df):
     missing_skills = resume_analysis['missing_key_skills']
     
     # Ensure skills are extracted from job postings
-    if 'skills' not in df.columns:
-        from utils.skill_tracker import extract_skills_from_jobs
-        job_df = extract_skills_from_jobs(df)
-    else:
-        job_df = df
+    job_df = ensure_job_skills(df)
     
     # Find emerging skills
     from utils.skill_tracker import identify_emerging_skills
     emerging_skills_df = identify_emerging_skills(job_df)
     
     # Filter emerging skills to those not in resume
-    resume_skills = resume_analysis['resume_skills']
+    resume_set = frozenset(resume_analysis['resume_skills'])
     emerging_recommendations = emerging_skills_df[
         (emerging_skills_df['skill'].isin(missing_skills)) & 
         (emerging_skills_df['growth_pct'] > 0)
@@ -367,15 +455,16 @@ def generate_skill_improvement_recommendations(resume_analysis, df):
     complementary_skills = []
     job_type_matches = resume_analysis.get('job_type_matches', [])
     
-    if job_type_matches and not isinstance(job_type_matches, list) and not job_type_matches.empty:
+    if isinstance(job_type_matches, pd.DataFrame) and not job_type_matches.empty:
         # Get top matching job type
         top_job_type = job_type_matches.iloc[0]['job_type']
         
-        # Find skills commonly associated with this job type
-        job_type_skills = job_df[job_df['job_type'] == top_job_type].explode('skills')['skills'].value_counts()
+        # Find skills commonly associated with this job type; the slice for a
+        # single job type is small, so a Counter beats explode + value_counts
+        job_type_skills = Counter(chain.from_iterable(job_df.loc[job_df['job_type'] == top_job_type, 'skills']))
         
         # Filter to skills not in resume
-        job_type_missing_skills = [skill for skill in job_type_skills.index[:5] if skill not in resume_skills]
+        job_type_missing_skills = [skill for skill, _ in job_type_skills.most_common(5) if skill not in resume_set]
         
         complementary_skills = job_type_missing_skills[:3]
     
@@ -396,50 +485,31 @@ def extract_resume_experience(resume_text):
     Returns:
         Estimated years of experience
     """
-    # Common patterns for years of experience
-    patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'experience\s*(?:of\s*)?(\d+)\+?\s*years?',
-        r'(?:work|professional)\s+experience\s*(?:of\s*)?(\d+)\+?\s*years?',
-        r'(?:worked|been working)\s+for\s+(\d+)\+?\s*years?'
-    ]
-    
     # Search for patterns
-    for pattern in patterns:
-        matches = re.findall(pattern, resume_text.lower())
+    resume_text_lower = resume_text.lower()
+    for pattern in _EXPERIENCE_YEARS_PATTERNS:
+        matches = pattern.findall(resume_text_lower)
         if matches:
             # Take the highest number
             years = max([int(year) for year in matches])
             return years
     
     # If no explicit years mentioned, try to estimate from work history
-    work_history_pattern = r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})\s*(?:-|–|to)\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present|Current|Now)'
-    
-    work_periods = re.findall(work_history_pattern, resume_text)
+    work_periods = _WORK_HISTORY_PATTERN.findall(resume_text)
     
     if work_periods:
-        total_months = 0
-        current_year = datetime.datetime.now().year
-        current_month = datetime.datetime.now().month
+        # Parse all start and end dates in one call each, with ongoing
+        # positions ending in the current month
+        starts, ends = zip(*work_periods)
+        current_month = pd.Timestamp.now().strftime('%b %Y')
+        ends = [current_month if end in ('Present', 'Current', 'Now') else end for end in ends]
+        start_dates = pd.to_datetime(pd.Series(starts), format='mixed', errors='coerce')
+        end_dates = pd.to_datetime(pd.Series(ends), format='mixed', errors='coerce')
         
-        for start, end in work_periods:
-            # Parse start date
-            try:
-                start_date = pd.to_datetime(start)
-                
-                # Parse end date
-                if any(current_term in end for current_term in ['Present', 'Current', 'Now']):
-                    end_date = pd.to_datetime(f"{current_month}/{current_year}")
-                else:
-                    end_date = pd.to_datetime(end)
-                
-                # Calculate duration in months
-                duration = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-                total_months += max(0, duration)
-            
-            except:
-                # Skip if date parsing fails
-                continue
+        # Calculate durations in months, skipping dates that failed to parse
+        durations = ((end_dates.dt.year - start_dates.dt.year) * 12 +
+                     (end_dates.dt.month - start_dates.dt.month))
+        total_months = durations.clip(lower=0).sum()
         
         # Convert months to years
         return total_months / 12
@@ -460,11 +530,7 @@ def recommend_job_titles(resume_skills, experience_years, df):
         List of recommended job titles
     """
     # Ensure skills are extracted from job postings
-    if 'skills' not in df.columns:
-        from utils.skill_tracker import extract_skills_from_jobs
-        job_df = extract_skills_from_jobs(df)
-    else:
-        job_df = df
+    job_df = ensure_job_skills(df)
     
     # Experience level mapping
     experience_levels = {
@@ -483,45 +549,66 @@ def recommend_job_titles(resume_skills, experience_years, df):
     if experience_level is None:
         experience_level = 'senior'  # Default to senior if not matched
     
-    # Calculate skill match for each job title
-    job_title_scores = {}
+    # Encode each job's skills as a bit set
+    skill_bits, skill_names = _skill_bit_matrix(job_df['skills'])
     
-    for _, row in job_df.iterrows():
-        job_title = row['job_title']
-        job_skills = row['skills']
-        
-        # Skip if no skills for this job
-        if not job_skills:
-            continue
-        
-        # Calculate match score
-        matching_skills = [skill for skill in resume_skills if skill in job_skills]
-        match_score = len(matching_skills) / len(job_skills) if job_skills else 0
-        
-        # Adjust score based on experience level match
-        if experience_level == 'entry' and ('senior' in job_title.lower() or 'lead' in job_title.lower()):
-            match_score *= 0.5
-        elif experience_level == 'mid' and 'senior' in job_title.lower():
-            match_score *= 0.8
-        elif experience_level == 'senior' and 'junior' in job_title.lower():
-            match_score *= 0.5
-        
-        # Add or update score
-        if job_title in job_title_scores:
-            job_title_scores[job_title] = max(job_title_scores[job_title], match_score)
-        else:
-            job_title_scores[job_title] = match_score
-    
-    # Convert to DataFrame
-    recommendations = pd.DataFrame({
-        'job_title': list(job_title_scores.keys()),
-        'match_score': list(job_title_scores.values())
-    })
+    # Skip jobs without skills
+    skill_counts = _popcount(skill_bits)
+    has_skills = skill_counts > 0
     
-    # Sort by match score
-    recommendations = recommendations.sort_values('match_score', ascending=False)
+    # Calculate match score for every job at once: the matching skills are
+    # the bits set in both the job's and the resume's bit set
+    resume_bits = _skill_bit_matrix([skill_names.intersection(resume_skills)], skill_names)[0]
+    matching_counts = _popcount(skill_bits[has_skills] & resume_bits)
+    match_score = matching_counts / skill_counts[has_skills]
     
-    # Get top 10 recommendations
-    top_recommendations = recommendations.head(10)['job_title'].tolist()
+    # Keep the best score for each job title, grouping the titles by
+    # categorical code
+    job_titles = job_df['job_title'].astype('category').array[has_skills]
+    recommendations = pd.Series(match_score).groupby(job_titles, sort=False, observed=True).max()
+    
+    # Adjust score based on experience level match; the penalty only depends
+    # on the title, so it is applied once per distinct title after taking
+    # the maximum
+    title_pattern, penalty = _TITLE_PENALTIES[experience_level]
+    penalized = np.asarray(recommendations.index.str.lower().str.contains(title_pattern), dtype=bool)
+    recommendations[penalized] *= penalty
+    
+    # Get top 10 recommendations by match score without sorting every title
+    top_recommendations = recommendations.nlargest(10).index.tolist()
+    
+    return top_recommendations
+
+def analyze_resume(resume_text, df):
+    """
+    Run the full resume analysis against the job market.
+    
+    Skills are extracted from the job postings and exploded once, and the
+    results are shared by every step instead of each analysis function
+    recomputing them.
+    
+    Args:
+        resume_text: Text content of resume
+        df: DataFrame containing job posting data
+        
+    Returns:
+        Dictionary with the market comparison results plus job type matches,
+        skill recommendations, years of experience and recommended job titles
+    """
+    # Extract skills from the job postings and the resume once
+    job_df = ensure_job_skills(df)
+    skill_index = build_skill_index(job_df)
+    resume_skills = extract_resume_skills(resume_text)
+    
+    # Compare to the market and find matching job types
+    analysis = compare_resume_to_market(resume_skills, job_df, skill_index=skill_index)
+    analysis['job_type_matches'] = find_matching_job_types(resume_skills, job_df, skill_index=skill_index)
+    
+    # Recommend skills and job titles
+    analysis['recommendations'] = generate_skill_improvement_recommendations(analysis, job_df)
+    analysis['experience_years'] = extract_resume_experience(resume_text)
+    analysis['recommended_job_titles'] = recommend_job_titles(
+        resume_skills, analysis['experience_years'], job_df
+    )
     
-    return top_recommendations
\ No newline at end of file
+    return analysis
@@ -4,6 +4,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 import re
 
+# Salary parsing patterns, compiled once and shared by the scalar and the
+# vectorized parsers
+_SALARY_CLEANUP_PATTERN = re.compile(r'[$, ]')
+_SALARY_NUMBER_PATTERN = re.compile(r'(\d+\.?\d*)')
+_PLAIN_NUMBER_PATTERN = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?')
+_RANGE_INDICATOR_PATTERN = re.compile('-|–|to')
+
 def extract_salary_value(salary_str):
     """
     Extract numeric salary value from string.
@@ -33,7 +40,7 @@ def extract_salary_value(salary_str):
             return np.nan
     
     # Extract numeric value using regex
-    match = re.search(r'(\d+\.?\d*)', salary_str)
+    match = _SALARY_NUMBER_PATTERN.search(salary_str)
     if match:
         try:
             return float(match.group(1))
@@ -42,6 +49,40 @@ def extract_salary_value(salary_str):
     
     return np.nan
 
+def _extract_salary_values(salary_strs):
+    """
+    Extract numeric salary values from a Series of strings.
+    
+    Vectorized counterpart of extract_salary_value using the pandas string
+    methods, so a whole column is converted without a Python call per row.
+    
+    Args:
+        salary_strs: Series of strings containing salary information
+        
+    Returns:
+        NumPy array of salary values, NaN where not extractable
+    """
+    # Remove currency symbols, commas and spaces
+    salary_strs = salary_strs.str.replace(_SALARY_CLEANUP_PATTERN, '', regex=True)
+    
+    # Handle 'k' for thousands; what is left must be a plain number
+    lowered = salary_strs.str.lower()
+    has_k = lowered.str.contains('k', regex=False, na=False).to_numpy(dtype=bool)
+    thousands = lowered.str.replace('k', '', regex=False).str.strip()
+    thousands = pd.to_numeric(
+        thousands.where(thousands.str.fullmatch(_PLAIN_NUMBER_PATTERN, na=False)),
+        errors='coerce'
+    )
+    
+    # Extract numeric value using regex
+    plain = pd.to_numeric(salary_strs.str.extract(_SALARY_NUMBER_PATTERN, expand=False), errors='coerce')
+    
+    return np.where(
+        has_k,
+        thousands.to_numpy(dtype=np.float64, na_value=np.nan) * 1000,
+        plain.to_numpy(dtype=np.float64, na_value=np.nan)
+    )
+
 def extract_salary_range(df):
     """
     Extract min/max salary ranges and convert to numeric values.
@@ -52,45 +93,46 @@ def extract_salary_range(df):
     Returns:
         DataFrame with added min_salary and max_salary columns
     """
-    # Create a copy to avoid modifying the original
-    processed_df = df.copy()
-    
     # If no salary column, return the original dataframe
-    if 'salary' not in processed_df.columns:
-        return processed_df
+    if 'salary' not in df.columns:
+        return df
     
-    # Identify range patterns (e.g., "$80,000 - $120,000", "80k-120k")
-    def extract_range(salary_str):
-        if not salary_str or pd.isna(salary_str) or salary_str == '':
-            return np.nan, np.nan
-        
-        salary_str = str(salary_str)
-        
-        # Look for range indicators
-        if '-' in salary_str or '–' in salary_str or 'to' in salary_str:
-            # Normalize separators
-            salary_str = salary_str.replace('–', '-').replace(' to ', '-')
-            
-            # Split by the separator
-            parts = salary_str.split('-')
-            if len(parts) >= 2:
-                min_val = extract_salary_value(parts[0].strip())
-                max_val = extract_salary_value(parts[1].strip())
-                return min_val, max_val
-        
-        # Single value, use as both min and max
-        value = extract_salary_value(salary_str)
-        return value, value
+    salary = df['salary']
     
-    # Apply the extraction
-    results = processed_df['salary'].apply(extract_range)
-    processed_df['min_salary'] = results.apply(lambda x: x[0])
-    processed_df['max_salary'] = results.apply(lambda x: x[1])
+    # Rows without salary information get NaN
+    has_salary = (salary.notna() & (salary != '') & (salary != 0)).to_numpy()
     
-    # Calculate average salary for easier analysis
-    processed_df['avg_salary'] = processed_df[['min_salary', 'max_salary']].mean(axis=1)
+    # Salary strings repeat heavily, so each distinct value is parsed once
+    codes, salary_strs = pd.factorize(salary.astype(str).where(has_salary, ''))
+    salary_strs = pd.Series(salary_strs, dtype=object)
     
-    return processed_df
+    # Identify range patterns (e.g., "$80,000 - $120,000", "80k-120k") and
+    # normalize their separators
+    is_range = salary_strs.str.contains(_RANGE_INDICATOR_PATTERN, regex=True)
+    normalized = salary_strs.where(
+        ~is_range,
+        salary_strs.str.replace('–', '-', regex=False).str.replace(' to ', '-', regex=False)
+    )
+    
+    # Split by the separator; single values are used as both min and max
+    parts = normalized.str.split('-')
+    min_salary = _extract_salary_values(parts.str[0].str.strip())
+    has_upper = (parts.str.len() > 1).to_numpy(dtype=bool)
+    upper = _extract_salary_values(parts.str[1].astype(str).str.strip())
+    max_salary = np.where(has_upper, upper, min_salary)
+    
+    min_salary = np.where(has_salary, min_salary[codes], np.nan)
+    max_salary = np.where(has_salary, max_salary[codes], np.nan)
+    
+    # Calculate average salary for easier analysis, ignoring a missing bound
+    avg_salary = np.where(
+        np.isnan(min_salary),
+        max_salary,
+        np.where(np.isnan(max_salary), min_salary, (min_salary + max_salary) / 2)
+    )
+    
+    # Add the new columns without copying the existing ones
+    return df.assign(min_salary=min_salary, max_salary=max_salary, avg_salary=avg_salary)
 
 def plot_salary_by_job_type(df):
     """
@@ -106,8 +148,8 @@ def plot_salary_by_job_type(df):
     if 'avg_salary' not in df.columns:
         df = extract_salary_range(df)
     
-    # Filter out rows without salary information
-    salary_df = df.dropna(subset=['avg_salary'])
+    # Keep only the columns plotted, for rows with salary information
+    salary_df = df.loc[df['avg_salary'].notna(), ['job_type', 'avg_salary']]
     
     # If no salary data available, return empty figure with message
     if len(salary_df) == 0:
@@ -158,12 +200,13 @@ def plot_salary_by_region(df):
     if 'avg_salary' not in df.columns:
         df = extract_salary_range(df)
     
-    # Add region information
-    salary_df = df.copy()
-    salary_df['region'] = salary_df['location'].apply(extract_region)
+    # Keep only the columns needed, for rows with salary information
+    salary_df = df.loc[df['avg_salary'].notna(), ['location', 'avg_salary']]
     
-    # Filter out rows without salary information
-    salary_df = salary_df.dropna(subset=['avg_salary'])
+    # Add region information, resolving each distinct location once
+    unique_locations = salary_df['location'].unique()
+    region_map = dict(zip(unique_locations, map(extract_region, unique_locations)))
+    salary_df = salary_df.assign(region=salary_df['location'].map(region_map))
     
     # If no salary data available, return empty figure with message
     if len(salary_df) == 0:
@@ -223,8 +266,8 @@ def plot_salary_trends(df):
     if 'avg_salary' not in df.columns:
         df = extract_salary_range(df)
     
-    # Filter out rows without salary information
-    salary_df = df.dropna(subset=['avg_salary'])
+    # Keep only the columns aggregated, for rows with salary information
+    salary_df = df.loc[df['avg_salary'].notna(), ['month_year', 'job_type', 'avg_salary']]
     
     # If no salary data available, return empty figure with message
     if len(salary_df) == 0:
@@ -301,30 +344,23 @@ def get_salary_statistics(df):
         'std': salary_df['avg_salary'].std()
     }
     
-    # Calculate job type statistics
-    job_type_stats = {}
-    for job_type in salary_df['job_type'].unique():
-        job_data = salary_df[salary_df['job_type'] == job_type]
-        if len(job_data) > 0:
-            job_type_stats[job_type] = {
-                'count': len(job_data),
-                'mean': job_data['avg_salary'].mean(),
-                'median': job_data['avg_salary'].median()
-            }
+    # Calculate the mean salary of every job type in one groupby, keeping
+    # the job types in order of first appearance
+    job_type_means = salary_df.groupby('job_type', sort=False)['avg_salary'].mean()
     
     # Find highest and lowest paying job types
-    if job_type_stats:
-        highest_paying = max(job_type_stats.items(), key=lambda x: x[1]['mean'])
-        lowest_paying = min(job_type_stats.items(), key=lambda x: x[1]['mean'])
+    if not job_type_means.empty:
+        highest_paying = job_type_means.idxmax()
+        lowest_paying = job_type_means.idxmin()
         
         overall_stats['highest_paying_job_type'] = {
-            'job_type': highest_paying[0],
-            'mean_salary': highest_paying[1]['mean']
+            'job_type': highest_paying,
+            'mean_salary': job_type_means[highest_paying]
         }
         
         overall_stats['lowest_paying_job_type'] = {
-            'job_type': lowest_paying[0],
-            'mean_salary': lowest_paying[1]['mean']
+            'job_type': lowest_paying,
+            'mean_salary': job_type_means[lowest_paying]
         }
     
     return overall_stats
\ No newline at end of file
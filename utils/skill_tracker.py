@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 import re
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -114,6 +117,129 @@ COMMON_SKILLS = {
     'ui/ux': ['ui/ux', 'ui design', 'ux design', 'user interface', 'user experience'],
 }
 
+def _trie_regex(patterns):
+    """
+    Build a regex alternation of literal patterns factored as a trie.
+    
+    Patterns sharing a prefix share its branch, so the regex engine follows
+    a single branch per character instead of trying every pattern in turn.
+    Longer continuations are tried before ending a pattern, so the longest
+    pattern that allows a match wins.
+    
+    Args:
+        patterns: Literal patterns
+        
+    Returns:
+        Regex source string matching any of the patterns
+    """
+    # Build the trie, marking pattern ends with an empty key
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def to_regex(node):
+        branches = [re.escape(char) + to_regex(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        regex = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Make the continuation optional where a pattern may also end here
+        if '' in node:
+            regex = ('(?:' + regex + ')' if len(branches) == 1 else regex) + '?'
+        return regex
+    
+    return to_regex(trie)
+
+def _compile_skill_matcher(skill_dict):
+    """
+    Compile the patterns of all skills into a single regex.
+    
+    The regex looks ahead at every position for the longest pattern that
+    matches there with word boundaries, so one scan finds every pattern
+    occurrence. A shorter pattern starting at the same position is a prefix
+    of the longest one, so its skills are attributed to the longest one.
+    
+    Args:
+        skill_dict: Dictionary of skills and their patterns
+        
+    Returns:
+        Tuple of the compiled regex, a dictionary mapping each pattern to the
+        skills it implies and a dictionary mapping each skill to its position
+        in skill_dict
+    """
+    # Factor the patterns as a trie, which tries longer patterns first so
+    # the longest match at a position wins
+    patterns = sorted({pattern for patterns in skill_dict.values() for pattern in patterns if pattern})
+    if patterns:
+        regex = re.compile(r'(?=\b(' + _trie_regex(patterns) + r')\b)')
+    else:
+        regex = re.compile(r'(?!)')
+    
+    # Map each pattern to its own skills and those of the shorter patterns
+    # that would also match at its start
+    pattern_skills = {}
+    for pattern in patterns:
+        pattern_skills[pattern] = tuple(
+            skill for skill, skill_patterns in skill_dict.items()
+            if any(other == pattern or (pattern.startswith(other) and re.match(re.escape(other) + r'\b', pattern))
+                   for other in skill_patterns if other)
+        )
+    
+    skill_order = {skill: i for i, skill in enumerate(skill_dict)}
+    
+    return regex, pattern_skills, skill_order
+
+@lru_cache(maxsize=32)
+def _cached_skill_matcher(skill_items):
+    """
+    Compile the skill matcher of a custom skill dictionary once.
+    
+    Args:
+        skill_items: Tuple of (skill, tuple of patterns) pairs
+        
+    Returns:
+        The skill matcher, as returned by _compile_skill_matcher
+    """
+    return _compile_skill_matcher(dict(skill_items))
+
+def _skills_from_patterns(patterns, pattern_skills, skill_order):
+    """
+    Collect the skills implied by the patterns found in a text.
+    
+    Args:
+        patterns: Patterns found by the skill matcher regex
+        pattern_skills: Dictionary mapping each pattern to its skills
+        skill_order: Dictionary mapping each skill to its position
+        
+    Returns:
+        List of skills in the order of the skill dictionary
+    """
+    found_skills = set()
+    for pattern in set(patterns):
+        found_skills.update(pattern_skills[pattern])
+    
+    return sorted(found_skills, key=skill_order.__getitem__)
+
+# Matcher for the common skills, compiled once at import
+_COMMON_SKILL_MATCHER = _compile_skill_matcher(COMMON_SKILLS)
+
+@lru_cache(maxsize=4096)
+def _extract_common_skills(text):
+    """
+    Extract the common skills from text, memoized since job titles repeat
+    heavily across postings; repeated texts skip lowercasing too.
+    
+    Args:
+        text: Text to extract skills from
+        
+    Returns:
+        Tuple of skills found in the text
+    """
+    regex, pattern_skills, skill_order = _COMMON_SKILL_MATCHER
+    return tuple(_skills_from_patterns(regex.findall(text.lower()), pattern_skills, skill_order))
+
 def extract_skills_from_text(text, skill_dict=COMMON_SKILLS):
     """
     Extract skills from job title or description text.
@@ -128,17 +254,20 @@ def extract_skills_from_text(text, skill_dict=COMMON_SKILLS):
     if not text or pd.isna(text):
         return []
     
-    text = str(text).lower()
-    found_skills = []
+    text = str(text)
     
-    for skill, patterns in skill_dict.items():
-        for pattern in patterns:
-            # Use word boundary for more accurate matching
-            if re.search(r'\b' + re.escape(pattern) + r'\b', text):
-                found_skills.append(skill)
-                break  # Found this skill, no need to check other patterns
+    # Reuse the precompiled, memoized matcher for the common skills
+    if skill_dict is COMMON_SKILLS:
+        return list(_extract_common_skills(text))
     
-    return found_skills
+    # Custom dictionaries are compiled once per distinct content
+    text = text.lower()
+    skill_items = tuple((skill, tuple(patterns)) for skill, patterns in skill_dict.items())
+    regex, pattern_skills, skill_order = _cached_skill_matcher(skill_items)
+    
+    # Find every pattern occurrence in a single scan (word boundaries
+    # included) and collect the skills they imply
+    return _skills_from_patterns(regex.findall(text), pattern_skills, skill_order)
 
 def extract_skills_from_jobs(df):
     """
@@ -150,36 +279,106 @@ def extract_skills_from_jobs(df):
     Returns:
         DataFrame with added 'skills' column
     """
-    # Create a copy to avoid modifying the original
-    skills_df = df.copy()
+    # Find the skill patterns once per distinct job title, so the string
+    # kernels only run over the distinct titles
+    regex, pattern_skills, skill_order = _COMMON_SKILL_MATCHER
+    title_codes, unique_titles = pd.factorize(df['job_title'], use_na_sentinel=False)
+    unique_titles = pd.Series(unique_titles, dtype=object)
+    title_patterns = unique_titles.where(unique_titles.notna(), '').astype(str).str.lower().str.findall(regex)
+    unique_skills = [_skills_from_patterns(patterns, pattern_skills, skill_order) for patterns in title_patterns]
+    
+    # Give every posting its own list of its title's skills, returning a new
+    # frame rather than modifying the original
+    return df.assign(skills=[list(unique_skills[code]) for code in title_codes])
+
+def ensure_job_skills(df):
+    """
+    Make sure the job postings have a 'skills' column.
     
-    # Extract skills from job titles
-    skills_df['skills'] = skills_df['job_title'].apply(extract_skills_from_text)
+    Args:
+        df: DataFrame containing job posting data
+        
+    Returns:
+        The DataFrame itself if it already has skills, otherwise a copy with
+        skills extracted from the job titles
+    """
+    if 'skills' in df.columns:
+        return df
     
-    return skills_df
+    return extract_skills_from_jobs(df)
 
-def get_top_skills(df, n=10):
+def prepare_skills(df):
     """
-    Get top n skills from the job postings.
+    Extract, explode and count the skills of the job postings once.
+    
+    The result can be passed to the skill analysis and plotting functions
+    as prepared_skills, so several of them can share the work.
     
     Args:
-        df: DataFrame containing job posting data with 'skills' column
-        n: Number of top skills to return
+        df: DataFrame containing job posting data
         
     Returns:
-        DataFrame with skill counts
+        Tuple of the DataFrame with a 'skills' column, its skills exploded
+        into separate rows (rows without skills dropped) and the number of
+        postings per skill, most common first
     """
     # Ensure skills are extracted
-    if 'skills' not in df.columns:
-        skills_df = extract_skills_from_jobs(df)
-    else:
-        skills_df = df
+    skills_df = ensure_job_skills(df)
     
     # Explode the skills lists into separate rows
     skills_exploded = skills_df.explode('skills')
     
+    # Remove rows with no skills
+    skills_exploded = skills_exploded.dropna(subset=['skills'])
+    
+    # Count occurrences of each skill straight from the skills lists, sorted
+    # like value_counts (ties in order of first appearance)
+    skill_counts = pd.Series(Counter(chain.from_iterable(skills_df['skills'])), name='count', dtype='int64')
+    skill_counts = skill_counts.rename_axis('skills').sort_values(ascending=False, kind='stable')
+    
+    return skills_df, skills_exploded, skill_counts
+
+def _resolve_prepared_skills(df, prepared_skills):
+    """
+    Prepare the skills of the job postings unless already done for them.
+    
+    Args:
+        df: DataFrame containing job posting data
+        prepared_skills: Optional result of prepare_skills(df) to reuse
+        
+    Returns:
+        Tuple as returned by prepare_skills
+    """
+    if prepared_skills is None:
+        return prepare_skills(df)
+    
+    # The prepared skills must belong to these job postings
+    if not prepared_skills[0].index.equals(df.index):
+        raise ValueError(
+            f"prepared_skills were not built from these job postings "
+            f"({len(prepared_skills[0])} prepared, {len(df)} in df)"
+        )
+    
+    return prepared_skills
+
+def get_top_skills(df, n=10, prepared_skills=None):
+    """
+    Get top n skills from the job postings.
+    
+    Args:
+        df: DataFrame containing job posting data with 'skills' column
+        n: Number of top skills to return
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
+        
+    Returns:
+        DataFrame with skill counts
+    """
+    # Extract and count the skills unless already done
+    skills_df, _, skill_counts = _resolve_prepared_skills(df, prepared_skills)
+    
     # Count occurrences of each skill
-    skill_counts = skills_exploded['skills'].value_counts().reset_index()
+    skill_counts = skill_counts.reset_index()
     skill_counts.columns = ['skill', 'count']
     
     # Calculate percentage
@@ -189,19 +388,21 @@ def get_top_skills(df, n=10):
     # Return top n skills
     return skill_counts.head(n)
 
-def plot_top_skills(df, n=15):
+def plot_top_skills(df, n=15, prepared_skills=None):
     """
     Create a bar chart of top skills.
     
     Args:
         df: DataFrame containing job posting data
         n: Number of top skills to display
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
     # Get top skills
-    top_skills = get_top_skills(df, n)
+    top_skills = get_top_skills(df, n, prepared_skills=prepared_skills)
     
     # If no skills found, return empty figure with message
     if len(top_skills) == 0:
@@ -243,27 +444,20 @@ def plot_top_skills(df, n=15):
     
     return fig
 
-def skills_by_job_type(df):
+def skills_by_job_type(df, prepared_skills=None):
     """
     Create a heatmap of skills by job type.
     
     Args:
         df: DataFrame containing job posting data
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
-    # Ensure skills are extracted
-    if 'skills' not in df.columns:
-        skills_df = extract_skills_from_jobs(df)
-    else:
-        skills_df = df
-    
-    # Explode the skills lists into separate rows
-    skills_exploded = skills_df.explode('skills')
-    
-    # Remove rows with no skills
-    skills_exploded = skills_exploded.dropna(subset=['skills'])
+    # Extract, explode and count the skills unless already done
+    _, skills_exploded, skill_counts = _resolve_prepared_skills(df, prepared_skills)
     
     # If no skills found, return empty figure with message
     if len(skills_exploded) == 0:
@@ -277,20 +471,32 @@ def skills_by_job_type(df):
         return fig
     
     # Get top 20 skills overall
-    top_skills = get_top_skills(skills_df, 20)['skill'].tolist()
+    top_skills = skill_counts.head(20).index.tolist()
     
     # Filter to only include top skills
     skills_exploded = skills_exploded[skills_exploded['skills'].isin(top_skills)]
     
-    # Create cross-tabulation of job types and skills
-    cross_tab = pd.crosstab(
-        index=skills_exploded['job_type'],
-        columns=skills_exploded['skills'],
-        normalize='index'  # Normalize by row (job type)
-    ) * 100  # Convert to percentage
-    
-    # Sort skills by overall popularity
-    cross_tab = cross_tab[top_skills]
+    # Use categoricals so the cross-tabulation works on integer codes, with
+    # skills sorted by overall popularity
+    job_types = skills_exploded['job_type'].astype('category').array
+    skills = pd.Categorical(skills_exploded['skills'], categories=top_skills)
+    
+    # Count each (job type, skill) pair into a matrix, skipping postings
+    # without a job type as crosstab does
+    n_skills = len(top_skills)
+    has_job_type = job_types.codes >= 0
+    counts = np.bincount(
+        job_types.codes[has_job_type].astype(np.int64) * n_skills + skills.codes[has_job_type],
+        minlength=len(job_types.categories) * n_skills
+    ).reshape(-1, n_skills)
+    
+    # Create cross-tabulation of job types and skills, normalized by row
+    # (job type) and converted to percentage
+    cross_tab = pd.DataFrame(
+        counts / counts.sum(axis=1, keepdims=True) * 100,
+        index=pd.Index(job_types.categories, name='job_type'),
+        columns=pd.Index(top_skills, name='skills')
+    )
     
     # Create heatmap
     fig = px.imshow(
@@ -312,27 +518,20 @@ def skills_by_job_type(df):
     
     return fig
 
-def plot_skill_trends(df):
+def plot_skill_trends(df, prepared_skills=None):
     """
     Create a line chart showing skill popularity trends over time.
     
     Args:
         df: DataFrame containing job posting data
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
-    # Ensure skills are extracted
-    if 'skills' not in df.columns:
-        skills_df = extract_skills_from_jobs(df)
-    else:
-        skills_df = df
-    
-    # Explode the skills lists into separate rows
-    skills_exploded = skills_df.explode('skills')
-    
-    # Remove rows with no skills
-    skills_exploded = skills_exploded.dropna(subset=['skills'])
+    # Extract, explode and count the skills unless already done
+    skills_df, skills_exploded, skill_counts = _resolve_prepared_skills(df, prepared_skills)
     
     # If no skills found, return empty figure with message
     if len(skills_exploded) == 0:
@@ -346,7 +545,7 @@ def plot_skill_trends(df):
         return fig
     
     # Get top 10 skills overall
-    top_skills = get_top_skills(skills_df, 10)['skill'].tolist()
+    top_skills = skill_counts.head(10).index.tolist()
     
     # Filter to only include top skills
     skills_exploded = skills_exploded[skills_exploded['skills'].isin(top_skills)]
@@ -354,17 +553,17 @@ def plot_skill_trends(df):
     # Group by month_year and skill, count occurrences
     skill_trends = skills_exploded.groupby(['month_year', 'skills']).size().reset_index(name='count')
     
-    # Calculate total jobs per month for percentage calculation
-    monthly_totals = skills_df.groupby('month_year').size().reset_index(name='total')
-    
-    # Merge the counts with totals
-    skill_trends = skill_trends.merge(monthly_totals, on='month_year')
+    # Look up the total jobs per month for percentage calculation; a map
+    # over the counted months replaces a merge, since every month with
+    # skills has a total
+    monthly_totals = skills_df['month_year'].value_counts(sort=False)
+    skill_trends['total'] = skill_trends['month_year'].map(monthly_totals)
     
     # Calculate percentage
     skill_trends['percentage'] = (skill_trends['count'] / skill_trends['total']) * 100
     
     # Convert month_year to datetime for proper sorting
-    skill_trends['date'] = pd.to_datetime(skill_trends['month_year'])
+    skill_trends['date'] = pd.to_datetime(skill_trends['month_year'], format='%Y-%m')
     skill_trends = skill_trends.sort_values('date')
     
     # Create the line chart
@@ -387,100 +586,86 @@ def plot_skill_trends(df):
     
     return fig
 
-def identify_emerging_skills(df, recent_periods=2):
+def identify_emerging_skills(df, recent_periods=2, prepared_skills=None):
     """
     Identify emerging skills with the highest growth rates.
     
     Args:
         df: DataFrame containing job posting data
         recent_periods: Number of recent periods to consider as "recent"
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         DataFrame with skill growth rates
     """
-    # Ensure skills are extracted
-    if 'skills' not in df.columns:
-        skills_df = extract_skills_from_jobs(df)
-    else:
-        skills_df = df
-    
-    # Explode the skills lists into separate rows
-    skills_exploded = skills_df.explode('skills')
-    
-    # Remove rows with no skills
-    skills_exploded = skills_exploded.dropna(subset=['skills'])
+    # Extract and explode the skills unless already done
+    skills_df, skills_exploded, _ = _resolve_prepared_skills(df, prepared_skills)
     
     # If no skills found, return empty DataFrame
     if len(skills_exploded) == 0:
         return pd.DataFrame()
     
-    # Convert month_year to datetime for sorting
-    skills_exploded['date'] = pd.to_datetime(skills_exploded['month_year'])
-    
-    # Sort by date
-    skills_exploded = skills_exploded.sort_values('date')
-    
-    # Get unique months
-    months = skills_exploded['month_year'].unique()
+    # Get unique months, parsing each distinct month_year once with its
+    # known format to sort them chronologically
+    month_codes, months = pd.factorize(skills_exploded['month_year'], use_na_sentinel=False)
+    month_order = np.argsort(pd.to_datetime(months, format='%Y-%m'), kind='stable')
+    months = months[month_order]
     
     # Need at least 2 months of data
     if len(months) < 2:
         return pd.DataFrame()
     
-    # Get recent and previous months
+    # Number every row by the chronological position of its month
+    month_positions = np.empty(len(months), dtype=np.int64)
+    month_positions[month_order] = np.arange(len(months))
+    row_positions = month_positions[month_codes]
+    
+    # Get recent and previous months, which are the latest and earliest
+    # positions respectively
     recent_months = months[-recent_periods:] if len(months) >= recent_periods else months[-1:]
     previous_months = months[:-recent_periods] if len(months) > recent_periods else months[0:1]
+    recent_mask = row_positions >= len(months) - len(recent_months)
+    previous_mask = row_positions < len(previous_months)
     
     # Count skills in recent and previous periods
-    recent_skills = skills_exploded[skills_exploded['month_year'].isin(recent_months)]['skills'].value_counts()
-    previous_skills = skills_exploded[skills_exploded['month_year'].isin(previous_months)]['skills'].value_counts()
+    recent_skills = skills_exploded['skills'][recent_mask].value_counts()
+    previous_skills = skills_exploded['skills'][previous_mask].value_counts()
     
-    # Calculate growth rates
-    growth_data = []
-    
-    for skill in set(recent_skills.index) | set(previous_skills.index):
-        recent_count = recent_skills.get(skill, 0)
-        previous_count = previous_skills.get(skill, 0)
-        
-        # Calculate growth
-        if previous_count > 0:
-            growth_pct = ((recent_count - previous_count) / previous_count) * 100
-        elif recent_count > 0:
-            growth_pct = 100  # New skill (wasn't in previous period)
-        else:
-            growth_pct = 0
-        
-        growth_data.append({
-            'skill': skill,
-            'recent_count': recent_count,
-            'previous_count': previous_count,
-            'growth_pct': growth_pct
-        })
+    # Line up the recent and previous counts of every skill, most recently
+    # demanded first
+    growth_df = pd.concat([recent_skills.rename('recent_count'), previous_skills.rename('previous_count')], axis=1)
+    growth_df = growth_df.fillna(0).astype('int64').rename_axis('skill').reset_index()
     
-    # Convert to DataFrame
-    growth_df = pd.DataFrame(growth_data)
+    # Calculate growth; skills new in the recent period count as 100% growth
+    recent_count = growth_df['recent_count']
+    previous_count = growth_df['previous_count']
+    growth_pct = ((recent_count - previous_count) / previous_count.where(previous_count > 0)) * 100
+    growth_df['growth_pct'] = growth_pct.where(previous_count > 0, np.where(recent_count > 0, 100.0, 0.0))
     
     # Only include skills that appear at least 3 times in recent period
     growth_df = growth_df[growth_df['recent_count'] >= 3]
     
-    # Sort by growth percentage
-    growth_df = growth_df.sort_values('growth_pct', ascending=False)
+    # Sort by growth percentage, keeping ties in order of recent demand
+    growth_df = growth_df.sort_values('growth_pct', ascending=False, kind='stable')
     
     return growth_df
 
-def plot_emerging_skills(df, n=10):
+def plot_emerging_skills(df, n=10, prepared_skills=None):
     """
     Create a bar chart of emerging skills with highest growth rates.
     
     Args:
         df: DataFrame containing job posting data
         n: Number of emerging skills to display
+        prepared_skills: Optional result of prepare_skills(df) to reuse; it
+            must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
     # Get emerging skills
-    emerging_skills = identify_emerging_skills(df)
+    emerging_skills = identify_emerging_skills(df, prepared_skills=prepared_skills)
     
     # If no skills found, return empty figure with message
     if len(emerging_skills) == 0:
@@ -4,6 +4,60 @@ import plotly.graph_objects as go
 import numpy as np
 import re
 
+# Polars is optional: when it is installed (along with pyarrow, which it needs to
+# convert string columns from pandas) the group counts of large frames run on its
+# multi-threaded engine, otherwise pandas is used
+try:
+    import polars as pl
+    import pyarrow
+except ImportError:
+    pl = None
+
+# Smallest frame worth converting to Polars for a group count
+_POLARS_MIN_ROWS = 100_000
+
+def _chronological_months(month_years):
+    """
+    Convert month_year strings to a categorical whose categories are the
+    months in chronological order, parsing each distinct month once.
+    
+    Args:
+        month_years: Series of month_year strings ('YYYY-MM')
+        
+    Returns:
+        Categorical Series of the months
+    """
+    month_years = month_years.astype('category')
+    months = month_years.cat.categories
+    month_dates = pd.to_datetime(months, format='%Y-%m')
+    
+    return month_years.cat.reorder_categories(months[np.argsort(month_dates, kind='stable')])
+
+def _count_groups_polars(frame, keys):
+    """
+    Count the rows of each group with Polars.
+    
+    Only the given columns are handed to Polars; the small result is
+    converted back to pandas for the plotting code.
+    
+    Args:
+        frame: DataFrame with the columns to group by
+        keys: Columns to group by; rows with a missing key are skipped
+        
+    Returns:
+        DataFrame with the key columns and a 'count' column, sorted by keys
+    """
+    return (
+        pl.from_pandas(frame)
+        .lazy()
+        .drop_nulls(keys)
+        .group_by(keys)
+        .agg(pl.len().cast(pl.Int64).alias('count'))
+        .sort(keys)
+        .collect()
+        .to_pandas()
+    )
+
 def plot_jobs_by_month(df):
     """
     Create a bar chart showing job postings by month.
@@ -14,33 +68,28 @@ def plot_jobs_by_month(df):
     Returns:
         Plotly figure object
     """
-    # Group by month_year and count
-    monthly_counts = df.groupby('month_year').size().reset_index(name='count')
-    
-    # Sort chronologically
-    monthly_counts['month_year_dt'] = pd.to_datetime(monthly_counts['month_year'])
-    monthly_counts = monthly_counts.sort_values('month_year_dt')
-    
-    # Create the plot
-    fig = px.bar(
-        monthly_counts, 
-        x='month_year', 
-        y='count',
-        labels={'month_year': 'Month', 'count': 'Number of Job Postings'},
-        title='Job Postings by Month',
-        text='count'
-    )
+    # Count job postings per month_year, in chronological order
+    month_years = _chronological_months(df['month_year'])
+    monthly_counts = month_years.value_counts(sort=False).rename_axis('month_year').reset_index(name='count')
+    
+    # Create the plot from the aggregated counts, with data labels on top of
+    # the bars
+    fig = go.Figure(go.Bar(
+        x=monthly_counts['month_year'],
+        y=monthly_counts['count'],
+        text=monthly_counts['count'],
+        textposition='outside',
+        hovertemplate='Month=%{x}<br>Number of Job Postings=%{text}<extra></extra>'
+    ))
     
     # Improve layout
     fig.update_layout(
+        title='Job Postings by Month',
         xaxis_title='Month',
         yaxis_title='Number of Job Postings',
-        xaxis={'categoryorder': 'array', 'categoryarray': monthly_counts['month_year'].tolist()}
+        xaxis={'categoryorder': 'array', 'categoryarray': month_years.cat.categories}
     )
     
-    # Add data labels on top of bars
-    fig.update_traces(textposition='outside')
-    
     return fig
 
 def plot_jobs_by_type(df):
@@ -58,20 +107,20 @@ def plot_jobs_by_type(df):
     type_counts.columns = ['job_type', 'count']
     
     # Create the plot
-    fig = px.pie(
-        type_counts, 
-        values='count', 
-        names='job_type',
-        title='Job Postings by Type',
+    fig = go.Figure(go.Pie(
+        labels=type_counts['job_type'],
+        values=type_counts['count'],
         hole=0.4,  # Donut chart
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
-    
-    # Improve layout
-    fig.update_traces(
         textposition='inside',
         textinfo='percent+label',
-        hoverinfo='label+percent+value'
+        hoverinfo='label+percent+value',
+        hovertemplate='job_type=%{label}<br>count=%{value}<extra></extra>'
+    ))
+    
+    # Improve layout
+    fig.update_layout(
+        title='Job Postings by Type',
+        piecolorway=px.colors.qualitative.Set3
     )
     
     return fig
@@ -86,30 +135,38 @@ def plot_jobs_trend(df):
     Returns:
         Plotly figure object
     """
-    # Group by month and job type
-    trend_data = df.groupby(['month_year', 'job_type']).size().reset_index(name='count')
-    
-    # Create datetime for proper ordering
-    trend_data['month_year_dt'] = pd.to_datetime(trend_data['month_year'])
-    trend_data = trend_data.sort_values('month_year_dt')
-    
-    # Create the plot
-    fig = px.line(
-        trend_data, 
-        x='month_year', 
-        y='count', 
-        color='job_type',
-        markers=True,
-        labels={'month_year': 'Month', 'count': 'Number of Job Postings', 'job_type': 'Job Type'},
-        title='Job Posting Trends by Type'
-    )
+    # Group by month and job type; 'YYYY-MM' strings sort chronologically, so
+    # the Polars result only needs its months turned into a categorical
+    if pl is not None and len(df) >= _POLARS_MIN_ROWS:
+        trend_data = _count_groups_polars(df[['month_year', 'job_type']], ['month_year', 'job_type'])
+        trend_data['month_year'] = _chronological_months(trend_data['month_year'])
+    else:
+        # As categoricals so the groups are formed from integer codes and
+        # come out in chronological order
+        trend_data = (df[['job_type']].astype('category')
+                      .assign(month_year=_chronological_months(df['month_year']))
+                      .groupby(['month_year', 'job_type'], observed=True).size().reset_index(name='count'))
+    
+    # Create the plot with a line per job type, in order of first appearance
+    fig = go.Figure()
+    for job_type, job_data in trend_data.groupby('job_type', sort=False, observed=True):
+        fig.add_trace(go.Scatter(
+            x=job_data['month_year'],
+            y=job_data['count'],
+            mode='lines+markers',
+            name=job_type,
+            legendgroup=job_type,
+            showlegend=True,
+            hovertemplate=f'Job Type={job_type}<br>Month=%{{x}}<br>Number of Job Postings=%{{y}}<extra></extra>'
+        ))
     
     # Improve layout
     fig.update_layout(
+        title='Job Posting Trends by Type',
         xaxis_title='Month',
         yaxis_title='Number of Job Postings',
         legend_title='Job Type',
-        xaxis={'categoryorder': 'array', 'categoryarray': trend_data['month_year'].unique().tolist()}
+        xaxis={'categoryorder': 'array', 'categoryarray': trend_data['month_year'].cat.remove_unused_categories().cat.categories}
     )
     
     return fig
@@ -124,40 +181,94 @@ def plot_company_distribution(df):
     Returns:
         Plotly figure object
     """
-    # Count by company and get top 15
-    company_counts = df['company'].value_counts().reset_index()
-    company_counts.columns = ['company', 'count']
+    # Count by company over integer codes, without sorting every company
+    company_codes, companies = pd.factorize(df['company'])
+    company_counts = pd.Series(
+        np.bincount(company_codes[company_codes >= 0], minlength=len(companies)),
+        index=companies
+    )
     
     # Take top 15 companies or all if less than 15
     top_n = min(15, len(company_counts))
-    top_companies = company_counts.head(top_n)
+    top_companies = company_counts.nlargest(top_n).rename_axis('company').reset_index(name='count')
     
     # Sort for visualization
     top_companies = top_companies.sort_values('count')
     
-    # Create the plot
-    fig = px.bar(
-        top_companies, 
-        y='company', 
-        x='count',
+    # Create the plot, with data labels
+    fig = go.Figure(go.Bar(
+        y=top_companies['company'],
+        x=top_companies['count'],
         orientation='h',
-        labels={'company': 'Company', 'count': 'Number of Job Postings'},
-        title=f'Top {top_n} Companies by Job Postings',
-        text='count'
-    )
+        text=top_companies['count'],
+        textposition='outside',
+        hovertemplate='Number of Job Postings=%{text}<br>Company=%{y}<extra></extra>'
+    ))
     
     # Improve layout
     fig.update_layout(
+        title=f'Top {top_n} Companies by Job Postings',
         yaxis_title='Company',
         xaxis_title='Number of Job Postings',
         height=max(400, top_n * 25)  # Adjust height based on number of companies
     )
     
-    # Add data labels
-    fig.update_traces(textposition='outside')
-    
     return fig
 
+# Location patterns of each region, in order of precedence
+_REGION_PATTERNS = {
+    'Remote': ['Remote'],
+    'Hybrid': ['Hybrid'],
+    'North America': ['Canada', 'Toronto', 'Vancouver', 'Montreal'],
+    'Europe': ['UK', 'London', 'Manchester', 'Berlin', 'Munich', 'Amsterdam', 'Paris', 'Dublin', 'Ireland', 'Germany', 'France', 'Netherlands'],
+    'Asia': ['Singapore', 'Tokyo', 'Bangalore', 'Hyderabad', 'Seoul', 'Hong Kong', 'India', 'Japan', 'South Korea'],
+    'Australia': ['Sydney', 'Melbourne', 'Australia'],
+    'US West': ['San Francisco', 'Los Angeles', 'Seattle', 'Portland', 'Denver', 'Phoenix', 'Salt Lake City', 'CA', 'WA', 'OR', 'CO', 'AZ', 'UT', 'NV'],
+    'US East': ['New York', 'Boston', 'Atlanta', 'Miami', 'Raleigh', 'Washington', 'Philadelphia', 'NY', 'MA', 'GA', 'FL', 'NC', 'DC', 'PA', 'VA'],
+    'US Central': ['Chicago', 'Austin', 'Dallas', 'Minneapolis', 'Detroit', 'Nashville', 'TX', 'IL', 'MN', 'MI', 'TN'],
+}
+
+def _compile_region_regex(region_patterns):
+    """
+    Compile the region patterns into a single regex over lowercased
+    locations.
+    
+    Place names match anywhere in the location, in order of region
+    precedence. Only then are the two-letter state and country codes tried,
+    as whole words, so codes like 'CA' no longer match inside names such as
+    'Chicago'. The matching alternative is a named group.
+    
+    Args:
+        region_patterns: Dictionary of regions and their location patterns
+        
+    Returns:
+        Tuple of the compiled regex and a dictionary mapping each group name
+        to its region
+    """
+    alternatives = []
+    group_regions = {}
+    
+    # Place names first, then codes, each in order of region precedence
+    for is_code in (False, True):
+        for region, patterns in region_patterns.items():
+            selected = [pattern.lower() for pattern in patterns if (len(pattern) <= 2 and pattern.isupper()) == is_code]
+            if not selected:
+                continue
+            
+            # Match codes as whole words
+            pattern_regex = '|'.join(map(re.escape, selected))
+            if is_code:
+                pattern_regex = r'\b(?:' + pattern_regex + r')\b'
+            
+            group_name = f'r{len(alternatives)}'
+            group_regions[group_name] = region
+            alternatives.append(f'(?P<{group_name}>.*?(?:{pattern_regex}))')
+    
+    return re.compile('(?:' + '|'.join(alternatives) + ')', re.DOTALL), group_regions
+
+# Region regex, compiled once at import
+_REGION_REGEX, _REGION_GROUPS = _compile_region_regex(_REGION_PATTERNS)
+
 def extract_region(location):
     """
     Extract region from location string for geographical grouping.
@@ -168,122 +279,164 @@ def extract_region(location):
     Returns:
         Region category for geographical analysis
     """
-    # Define region patterns
-    us_regions = {
-        'US West': ['San Francisco', 'Los Angeles', 'Seattle', 'Portland', 'Denver', 'Phoenix', 'Salt Lake City', 'CA', 'WA', 'OR', 'CO', 'AZ', 'UT', 'NV'],
-        'US East': ['New York', 'Boston', 'Atlanta', 'Miami', 'Raleigh', 'Washington', 'Philadelphia', 'NY', 'MA', 'GA', 'FL', 'NC', 'DC', 'PA', 'VA'],
-        'US Central': ['Chicago', 'Austin', 'Dallas', 'Minneapolis', 'Detroit', 'Nashville', 'TX', 'IL', 'MN', 'MI', 'TN'],
-    }
-    
-    regions = {
-        'Remote': ['Remote'],
-        'Hybrid': ['Hybrid'],
-        'North America': ['Canada', 'Toronto', 'Vancouver', 'Montreal'],
-        'Europe': ['UK', 'London', 'Manchester', 'Berlin', 'Munich', 'Amsterdam', 'Paris', 'Dublin', 'Ireland', 'Germany', 'France', 'Netherlands'],
-        'Asia': ['Singapore', 'Tokyo', 'Bangalore', 'Hyderabad', 'Seoul', 'Hong Kong', 'India', 'Japan', 'South Korea'],
-        'Australia': ['Sydney', 'Melbourne', 'Australia']
-    }
-    
-    # Add US regions to the regions dictionary
-    regions.update(us_regions)
-    
-    # Check if location matches any region pattern
-    location = str(location).lower()
-    for region, patterns in regions.items():
-        for pattern in patterns:
-            if pattern.lower() in location:
-                return region
+    return _match_region(str(location).lower())
+
+def _match_region(lower_location):
+    """
+    Match an already lowercased location against the region patterns.
+    
+    Args:
+        lower_location: Lowercased location string
+        
+    Returns:
+        Region category for geographical analysis
+    """
+    # Match the location against all region patterns in a single regex call
+    match = _REGION_REGEX.match(lower_location)
+    if match:
+        return _REGION_GROUPS[match.lastgroup]
     
     # Default region if no match found
     return 'Other'
 
-def plot_geographical_distribution(df):
+def classify_locations(df):
+    """
+    Classify every location by region and by location type in one pass.
+    
+    The result can be passed to both location plots as
+    classified_locations, so they share the work.
+    
+    Args:
+        df: DataFrame containing job posting data
+        
+    Returns:
+        Tuple of two categorical Series indexed like df: the region names,
+        with the regions as categories in order of first appearance, and the
+        location types (Remote, Hybrid, On-site)
+    """
+    # Resolve each distinct location once, lowercasing them all in one
+    # vectorized pass; missing locations match nothing
+    location_codes, unique_locations = pd.factorize(df['location'], use_na_sentinel=False)
+    lower_locations = pd.Series(unique_locations, dtype=object).astype(str).str.lower().fillna('')
+    
+    # Match the region of each distinct location
+    region_codes, regions = pd.factorize(np.array([_match_region(location) for location in lower_locations], dtype=object))
+    
+    # Categorize location types, with remote taking precedence over hybrid,
+    # straight into the codes of a categorical
+    is_remote = lower_locations.str.contains('remote', regex=False)
+    is_hybrid = lower_locations.str.contains('hybrid', regex=False)
+    location_type_codes = np.select([is_remote, is_hybrid], [2, 0], default=1)
+    
+    return (
+        pd.Series(pd.Categorical.from_codes(region_codes[location_codes], categories=regions),
+                  index=df.index, name='region'),
+        pd.Series(pd.Categorical.from_codes(location_type_codes[location_codes], categories=['Hybrid', 'On-site', 'Remote']),
+                  index=df.index, name='location_type')
+    )
+
+def _resolve_classified_locations(df, classified_locations):
+    """
+    Classify the locations of the job postings unless already done for them.
+    
+    Args:
+        df: DataFrame containing job posting data
+        classified_locations: Optional result of classify_locations(df) to reuse
+        
+    Returns:
+        Tuple as returned by classify_locations
+    """
+    if classified_locations is None:
+        return classify_locations(df)
+    
+    # The classified locations must belong to these job postings
+    if not classified_locations[0].index.equals(df.index):
+        raise ValueError(
+            f"classified_locations were not built from these job postings "
+            f"({len(classified_locations[0])} classified, {len(df)} in df)"
+        )
+    
+    return classified_locations
+
+def plot_geographical_distribution(df, classified_locations=None):
     """
     Create a bar chart showing job posting distribution by region.
     
     Args:
         df: Processed DataFrame containing job posting data
+        classified_locations: Optional result of classify_locations(df) to
+            reuse; it must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
-    # Create a copy to avoid modifying the original dataframe
-    geo_df = df.copy()
-    
     # Extract region from location
-    geo_df['region'] = geo_df['location'].apply(extract_region)
+    regions = _resolve_classified_locations(df, classified_locations)[0]
     
-    # Group by region and count
-    region_counts = geo_df['region'].value_counts().reset_index()
+    # Group by region and count, sorted by count for better visualization
+    region_counts = regions.value_counts().reset_index()
     region_counts.columns = ['region', 'count']
     
-    # Sort by count for better visualization
-    region_counts = region_counts.sort_values('count', ascending=False)
-    
-    # Create the bar chart
-    fig = px.bar(
-        region_counts,
-        x='region',
-        y='count',
-        color='count',
-        labels={'region': 'Region', 'count': 'Number of Job Postings'},
-        title='Geographical Distribution of Job Postings',
-        text='count',
-        color_continuous_scale='Viridis'
-    )
+    # Create the bar chart, colored by count, with data labels
+    fig = go.Figure(go.Bar(
+        x=region_counts['region'],
+        y=region_counts['count'],
+        marker={'color': region_counts['count'], 'coloraxis': 'coloraxis'},
+        text=region_counts['count'],
+        textposition='outside',
+        hovertemplate='Region=%{x}<br>Number of Job Postings=%{marker.color}<extra></extra>'
+    ))
     
     fig.update_layout(
+        title='Geographical Distribution of Job Postings',
         xaxis_title='Region',
         yaxis_title='Number of Job Postings',
-        xaxis={'categoryorder': 'total descending'}
+        xaxis={'categoryorder': 'total descending'},
+        coloraxis={'colorscale': px.colors.sequential.Viridis, 'colorbar': {'title': {'text': 'Number of Job Postings'}}}
     )
     
-    # Add data labels
-    fig.update_traces(textposition='outside')
-    
     return fig
 
-def plot_location_type_distribution(df):
+def plot_location_type_distribution(df, classified_locations=None):
     """
     Create a stacked bar chart showing job types by location type
     (Remote, Hybrid, On-site).
     
     Args:
         df: Processed DataFrame containing job posting data
+        classified_locations: Optional result of classify_locations(df) to
+            reuse; it must have been built from the same job postings
         
     Returns:
         Plotly figure object
     """
-    # Create a copy to avoid modifying the original dataframe
-    loc_df = df.copy()
-    
-    # Categorize location types
-    def categorize_location(location):
-        location = str(location).lower()
-        if 'remote' in location:
-            return 'Remote'
-        elif 'hybrid' in location:
-            return 'Hybrid'
-        else:
-            return 'On-site'
-    
-    loc_df['location_type'] = loc_df['location'].apply(categorize_location)
+    # Build a frame of just the two grouping columns, as categoricals so the
+    # groups are formed from integer codes
+    loc_df = pd.DataFrame({
+        'location_type': _resolve_classified_locations(df, classified_locations)[1].array,
+        'job_type': df['job_type'].astype('category').array
+    })
     
     # Group by location type and job type
-    location_job_counts = loc_df.groupby(['location_type', 'job_type']).size().reset_index(name='count')
-    
-    # Create the stacked bar chart
-    fig = px.bar(
-        location_job_counts,
-        x='location_type',
-        y='count',
-        color='job_type',
-        labels={'location_type': 'Location Type', 'count': 'Number of Job Postings', 'job_type': 'Job Type'},
-        title='Job Types by Location Type',
-        color_discrete_sequence=px.colors.qualitative.Safe
-    )
+    location_job_counts = loc_df.groupby(['location_type', 'job_type'], observed=True).size().reset_index(name='count')
+    
+    # Create the stacked bar chart with a bar trace per job type, in order of
+    # first appearance
+    colors = px.colors.qualitative.Safe
+    fig = go.Figure()
+    for i, (job_type, job_data) in enumerate(location_job_counts.groupby('job_type', sort=False, observed=True)):
+        fig.add_trace(go.Bar(
+            x=job_data['location_type'],
+            y=job_data['count'],
+            name=job_type,
+            legendgroup=job_type,
+            showlegend=True,
+            marker_color=colors[i % len(colors)],
+            hovertemplate=f'Job Type={job_type}<br>Location Type=%{{x}}<br>Number of Job Postings=%{{y}}<extra></extra>'
+        ))
     
     fig.update_layout(
+        title='Job Types by Location Type',
         xaxis_title='Location Type',
         yaxis_title='Number of Job Postings',
         legend_title='Job Type',